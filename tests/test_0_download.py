@@ -1,6 +1,11 @@
+import bz2
+import errno
 import os
+import shutil
+import subprocess
 from pathlib import Path
 
+import pytest
 import responses
 
 from wikidict import download
@@ -133,6 +138,45 @@ def test_ongoing_dump(craft_data, capsys):
     assert not (output_dir / "pages-20200514.xml.bz2").is_file()
 
 
+@responses.activate
+def test_fetch_pages_interrupted(tmp_path):
+    """It should not keep a partial file when the download is interrupted."""
+    date = "20200417"
+    responses.add(responses.GET, DUMP_URL.format("fr", date), body=b"x" * 1024)
+
+    def callback(text: str, total: int, last: bool) -> None:
+        raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        download.fetch_pages(date, "fr", tmp_path, callback)
+    assert not (tmp_path / f"pages-{date}.xml.bz2").is_file()
+
+
+@responses.activate
+def test_fetch_pages_fallocate_not_supported(tmp_path, monkeypatch):
+    """It should download the file even if the filesystem cannot pre-allocate it."""
+
+    calls = []
+
+    def fallocate(*args):
+        calls.append(args)
+        raise OSError(errno.EOPNOTSUPP, os.strerror(errno.EOPNOTSUPP))
+
+    monkeypatch.setattr(download.os, "posix_fallocate", fallocate, raising=False)
+
+    date = "20200417"
+    responses.add(
+        responses.GET,
+        DUMP_URL.format("fr", date),
+        body=b"x" * 1024,
+        headers={"Content-Length": "1024"},
+    )
+
+    output = download.fetch_pages(date, "fr", tmp_path, download.callback_progress_ci)
+    assert calls
+    assert output.read_bytes() == b"x" * 1024
+
+
 def test_progress_callback_normal(capsys):
     download.callback_progress("Some text: ", 42 * 1024, False)
     captured = capsys.readouterr()
@@ -151,3 +195,57 @@ def test_progress_callback_ci(capsys):
     download.callback_progress_ci("Some text: ", 42 * 1024, True)
     captured = capsys.readouterr()
     assert captured.out == ". OK [43,008 bytes]\n"
+
+
+def test_decompress_without_external_tool(tmp_path, monkeypatch):
+    """It should fallback to the Python module when no external tool is available."""
+    monkeypatch.setattr(download, "get_bzip2_command", lambda: None)
+
+    file = tmp_path / "pages-20200417.xml.bz2"
+    file.write_bytes(bz2.compress(b"<mediawiki></mediawiki>"))
+
+    output = download.decompress(file, download.callback_progress_ci)
+    assert output == tmp_path / "pages-20200417.xml"
+    assert output.read_bytes() == b"<mediawiki></mediawiki>"
+
+
+def test_decompress_without_external_tool_truncated_file(tmp_path, monkeypatch):
+    """It should not keep a partial file when the BZ2 file is truncated."""
+    monkeypatch.setattr(download, "get_bzip2_command", lambda: None)
+
+    file = tmp_path / "pages-20200417.xml.bz2"
+    file.write_bytes(bz2.compress(b"<mediawiki></mediawiki>" * 100)[:-10])
+
+    with pytest.raises(EOFError):
+        download.decompress(file, download.callback_progress_ci)
+    assert not (tmp_path / "pages-20200417.xml").is_file()
+
+
+@pytest.mark.skipif(not shutil.which("bzip2"), reason="No BZ2 external tool")
+def test_decompress_external_tool_error(tmp_path, monkeypatch):
+    """It should not keep a partial file when the external tool fails."""
+    # Any external tool takes the same code path, use the most common one
+    monkeypatch.setattr(download, "get_bzip2_command", lambda: shutil.which("bzip2"))
+
+    file = tmp_path / "pages-20200417.xml.bz2"
+    file.write_bytes(b"not a BZ2 file")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        download.decompress(file, download.callback_progress_ci)
+    assert not (tmp_path / "pages-20200417.xml").is_file()
+
+
+@pytest.mark.skipif(not shutil.which("bzip2"), reason="No BZ2 external tool")
+def test_decompress_external_tool_interrupted(tmp_path, monkeypatch):
+    """It should not keep a partial file when the decompression is interrupted."""
+    monkeypatch.setattr(download, "get_bzip2_command", lambda: shutil.which("bzip2"))
+
+    file = tmp_path / "pages-20200417.xml.bz2"
+    file.write_bytes(bz2.compress(b"<mediawiki></mediawiki>"))
+
+    def callback(text: str, total: int, last: bool) -> None:
+        raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        download.decompress(file, callback)
+    assert not (tmp_path / "pages-20200417.xml").is_file()
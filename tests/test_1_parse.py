@@ -85,6 +85,36 @@ def test_parse_redirected_word(tmp_path):
     assert not parse.process(file, "fr")
 
 
+def test_parse_redirected_word_with_wikicode(tmp_path):
+    file = tmp_path / "page.xml"
+    file.write_text(
+        """\
+<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xml:lang="sv">
+<page>
+    <title>Svenskan</title>
+    <ns>0</ns>
+    <id>42</id>
+    <redirect title="svenska" />
+    <revision>
+        <id>403956</id>
+        <timestamp>2006-02-13T09:08:31Z</timestamp>
+        <contributor>
+            <username>Bob</username>
+            <id>-42</id>
+        </contributor>
+        <model>wikitext</model>
+        <format>text/x-wiki</format>
+        <text bytes="25" xml:space="preserve">#OMDIRIGERING [[svenska]]</text>
+        <sha1>40helna9646ffk0utvwm8bkdlzi1eck</sha1>
+    </revision>
+</page>
+</mediawiki>
+"""
+    )
+
+    assert not parse.process(file, "sv")
+
+
 def test_parse_word_without_wikicode(tmp_path):
     file = tmp_path / "page.xml"
     file.write_text(
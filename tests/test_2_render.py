@@ -31,6 +31,12 @@ def test_render_word(page):
     assert words["π"]
 
 
+def test_render_word_worker(page):
+    word = ["π", page("π", "fr")]
+    words = render.render_word_worker(word, "fr")
+    assert list(words) == ["π"]
+
+
 def test_render_word_sv_with_almost_empty_definition(page):
     word = ["Götet", page("Götet", "sv")]
     words = {}
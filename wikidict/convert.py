@@ -60,37 +60,40 @@ class KoboBaseFormat(BaseFormat):
     @staticmethod
     def create_etymology(etymologies: List[Definitions]) -> str:
         """Return the HTML code to include for the etymology of a word."""
-        result = ""
-        if etymologies:
-            for etymology in etymologies:
-                if isinstance(etymology, str):
-                    result += f"<p>{etymology}</p>"
-                else:
-                    result += "<ol>"
-                    for sub_etymology in etymology:
-                        result += f"<li>{sub_etymology}</li>"
-                    result += "</ol>"
-            result += "<br />"
-        return result
+        if not etymologies:
+            return ""
+
+        result: List[str] = []
+        for etymology in etymologies:
+            if isinstance(etymology, str):
+                result.append(f"<p>{etymology}</p>")
+            else:
+                result.append("<ol>")
+                result.extend(
+                    f"<li>{sub_etymology}</li>" for sub_etymology in etymology
+                )
+                result.append("</ol>")
+        result.append("<br />")
+        return "".join(result)
 
     @staticmethod
     def create_definitions(details: Word) -> str:
         """Return the HTML code to include for the definitions of a word."""
-        definitions = ""
+        definitions: List[str] = []
         for definition in details.definitions:
             if isinstance(definition, str):
-                definitions += f"<li>{definition}</li>"
+                definitions.append(f"<li>{definition}</li>")
             else:
-                definitions += '<ol style="list-style-type:lower-alpha">'
+                definitions.append('<ol style="list-style-type:lower-alpha">')
                 for subdef in definition:
                     if isinstance(subdef, str):
-                        definitions += f"<li>{subdef}</li>"
+                        definitions.append(f"<li>{subdef}</li>")
                     else:
-                        definitions += '<ol style="list-style-type:lower-roman">'
-                        definitions += "".join(f"<li>{d}</li>" for d in subdef)
-                        definitions += "</ol>"
-                definitions += "</ol>"
-        return definitions
+                        definitions.append('<ol style="list-style-type:lower-roman">')
+                        definitions.extend(f"<li>{d}</li>" for d in subdef)
+                        definitions.append("</ol>")
+                definitions.append("</ol>")
+        return "".join(definitions)
 
 
 class KoboFormat(KoboBaseFormat):
@@ -2,15 +2,25 @@
 import bz2
 import os
 import re
+import shutil
+import subprocess
 from functools import partial
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 import requests
 from requests.exceptions import HTTPError
 
 from .constants import BASE_URL, DUMP_URL
 
+# Shared HTTP session, to reuse connections
+SESSION = requests.Session()
+
+# External BZ2 decompressors, by order of preference.
+# The first ones are multi-threaded, and so way faster than the Python module.
+# bzip2 is not listed: it is single-threaded and uses the same libbz2 as the Python module.
+BZIP2_COMMANDS = ("lbzip2", "pbzip2")
+
 
 def callback_progress(text: str, total: int, last: bool) -> None:
     """Progression callback. Used when fetching the Wiktionary dump and when extracting it."""
@@ -27,8 +37,18 @@ def callback_progress_ci(text: str, total: int, last: bool) -> None:
     print(msg, end="", flush=True)
 
 
+def get_bzip2_command() -> Optional[str]:
+    """Return the path of the first available external BZ2 decompressor, if any."""
+    for command in BZIP2_COMMANDS:
+        if path := shutil.which(command):
+            return path
+    return None
+
+
 def decompress(file: Path, callback: Callable[[str, int, bool], None]) -> Path:
-    """Decompress a BZ2 file."""
+    """Decompress a BZ2 file.
+    An external tool will be used when available, else it falls back to the Python module.
+    """
     output = file.with_suffix(file.suffix.replace(".bz2", ""))
     if output.is_file():
         return output
@@ -36,14 +56,30 @@ def decompress(file: Path, callback: Callable[[str, int, bool], None]) -> Path:
     msg = f">>> Uncompressing into {output.name}: "
     print(msg, end="", flush=True)
 
-    comp = bz2.BZ2Decompressor()
-    with file.open("rb") as fi, output.open(mode="wb") as fo:
-        total = 0
-        for data in iter(partial(fi.read, 1024**2), b""):
-            uncompressed = comp.decompress(data)
-            fo.write(uncompressed)
-            total += len(uncompressed)
-            callback(msg, total, False)
+    try:
+        with output.open(mode="wb") as fo:
+            total = 0
+            if command := get_bzip2_command():
+                with subprocess.Popen(
+                    [command, "-dc", str(file)], stdout=subprocess.PIPE
+                ) as proc:
+                    assert proc.stdout
+                    for uncompressed in iter(partial(proc.stdout.read, 1024**2), b""):
+                        fo.write(uncompressed)
+                        total += len(uncompressed)
+                        callback(msg, total, False)
+                if proc.returncode:
+                    raise subprocess.CalledProcessError(proc.returncode, proc.args)
+            else:
+                with bz2.open(file, mode="rb") as fi:
+                    for uncompressed in iter(partial(fi.read, 8 * 1024**2), b""):
+                        fo.write(uncompressed)
+                        total += len(uncompressed)
+                        callback(msg, total, False)
+    except BaseException:
+        # Do not keep a partial file, it would be used as-is on the next run
+        output.unlink(missing_ok=True)
+        raise
 
     callback(msg, output.stat().st_size, True)
 
@@ -55,7 +91,7 @@ def fetch_snapshots(locale: str) -> List[str]:
     Return a list of sorted dates.
     """
     url = BASE_URL.format(locale)
-    with requests.get(url) as req:
+    with SESSION.get(url) as req:
         req.raise_for_status()
         return sorted(re.findall(r'href="(\d+)/"', req.text))
 
@@ -75,14 +111,36 @@ def fetch_pages(
     msg = f">>> Fetching {url}: "
     print(msg, end="", flush=True)
 
-    with output.open(mode="wb") as fh, requests.get(url, stream=True) as req:
-        req.raise_for_status()
-        total = 0
-        for chunk in req.iter_content(chunk_size=1024**2):
-            if chunk:
-                fh.write(chunk)
-                total += len(chunk)
-                callback(msg, total, False)
+    # No compression on-the-fly, so that the Content-Length is the file size
+    headers = {"Accept-Encoding": "identity"}
+    try:
+        with output.open(mode="wb") as fh, SESSION.get(
+            url, headers=headers, stream=True
+        ) as req:
+            req.raise_for_status()
+
+            # Allocate the whole file at once, it reduces the fragmentation of big dumps
+            size = int(req.headers.get("Content-Length") or 0)
+            if size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fh.fileno(), 0, size)
+                except OSError:
+                    # Not supported by the filesystem (EOPNOTSUPP), it is only an optimization
+                    pass
+
+            total = 0
+            for chunk in req.iter_content(chunk_size=4 * 1024**2):
+                if chunk:
+                    fh.write(chunk)
+                    total += len(chunk)
+                    callback(msg, total, False)
+
+            # Drop allocated bytes that were not received, if any
+            fh.truncate()
+    except BaseException:
+        # Do not keep a partial file, it would be used as-is on the next run
+        output.unlink(missing_ok=True)
+        raise
 
     callback(msg, output.stat().st_size, True)
 
@@ -1,18 +1,20 @@
 """Get and render a word."""
 import re
 
-import requests
-
+from .download import SESSION
 from .stubs import Word
 from .render import parse_word
 from .user_functions import int_to_roman
 from .utils import convert_pronunciation, convert_gender, get_word_of_the_day
 
+# <span class="foo">bar</span> -> bar
+_RE_HTML_TAG = re.compile(r"<[^>]+/?>")
+
 
 def get_word(word: str, locale: str) -> Word:
     """Get a *word* wikicode and parse it."""
     url = f"https://{locale}.wiktionary.org/w/index.php?title={word}&action=raw"
-    with requests.get(url) as req:
+    with SESSION.get(url) as req:
         code = req.text
     return parse_word(word, code, locale, force=True)
 
@@ -26,7 +28,7 @@ def strip_html(text: str) -> str:
             return repr(text)
         text = text.replace("<br>", "\n")
         text = text.replace("<br/>", "\n")
-        text = re.sub(r"<[^>]+/?>", "", text)
+        text = _RE_HTML_TAG.sub("", text)
         text = text.replace("&minus;", "-")
         text = text.replace("&nbsp;", " ")
         text = text.replace("&thinsp;", " ")
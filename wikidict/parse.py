@@ -1,84 +1,78 @@
 """Parse and store raw Wiktionary data."""
 import json
 import os
-from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Generator, Optional, Tuple
-from xml.etree import ElementTree
-from xml.etree.ElementTree import Element
+
+from lxml import etree
+
 from .lang import head_sections
 
+# XML tags of interest, from the MediaWiki export namespace
+TAG_PAGE = "{http://www.mediawiki.org/xml/export-0.10/}page"
+TAG_REDIRECT = "{http://www.mediawiki.org/xml/export-0.10/}redirect"
+TAG_TEXT = "{http://www.mediawiki.org/xml/export-0.10/}text"
+TAG_TITLE = "{http://www.mediawiki.org/xml/export-0.10/}title"
+
 
-def xml_iter_parse(file: Path) -> Generator[Element, None, None]:
+def xml_iter_parse(file: Path) -> Generator[Tuple[str, str], None, None]:
     """Efficient XML parsing for big files.
-    Elements are yielded when they meet the "page" tag.
+    The title and the Wikicode are yielded when they meet the "page" tag, redirect pages are skipped.
+    Only those tags are seen from Python, other children of the page are never looked at.
     """
 
-    doc = ElementTree.iterparse(file, events=("start", "end"))
-    _, root = next(doc)
-
-    start_tag = None
-
-    for event, element in doc:
-        if (
-            start_tag is None
-            and event == "start"
-            and element.tag == "{http://www.mediawiki.org/xml/export-0.10/}page"
-        ):
-            start_tag = element.tag
-        elif start_tag is not None and event == "end" and element.tag == start_tag:
-            yield element
-            start_tag = None
+    doc = etree.iterparse(
+        str(file),
+        events=("end",),
+        tag=(TAG_PAGE, TAG_REDIRECT, TAG_TEXT, TAG_TITLE),
+        huge_tree=True,
+    )
+
+    word = code = ""
+    redirect = False
+
+    for _, element in doc:
+        if element.tag == TAG_TEXT:
+            # The Wikicode of the revision, when a page has one
+            code = element.text or ""
+        elif element.tag == TAG_TITLE:
+            word = element.text or ""
+        elif element.tag == TAG_REDIRECT:
+            # A "redirect" page still has Wikicode (#REDIRECT [[...]]), but no definitions
+            redirect = True
+        else:
+            if not redirect:
+                yield word, code
+            word = code = ""
+            redirect = False
 
             # Keep memory low
-            root.clear()
-
-
-def xml_parse_element(element: Element, locale: str) -> Tuple[str, str]:
-    """Parse the *element* to retrieve the word and its definitions."""
-    revision = element[3]
-    if revision.tag == "{http://www.mediawiki.org/xml/export-0.10/}restrictions":
-        # When a word is "restricted", then the revision comes just after
-        revision = element[4]
-    elif not revision:
-        # This is a "redirect" page, not interesting.
-        return "", ""
-
-    # The Wikicode can be at different indexes, but not ones lower than 5
-    for info in revision[5:]:
-        if info.tag == "{http://www.mediawiki.org/xml/export-0.10/}text":
-            code = info.text or ""
-            break
-    else:
-        # No Wikicode, maybe an unfinished page.
-        return "", ""
-
-    # no interesting head section, a foreign word?
-    if all(section not in code for section in head_sections[locale]):
-        return "", ""
-
-    word = element[0].text or ""  # title
-    return word, code
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
 
 
 def process(file: Path, locale: str) -> Dict[str, str]:
     """Process the big XML file and retain only information we are interested in."""
-    words: Dict[str, str] = defaultdict(str)
+    sections = head_sections[locale]
 
     print(f">>> Processing {file} ...", flush=True)
-    for element in xml_iter_parse(file):
-        word, code = xml_parse_element(element, locale)
-        if word and code and ":" not in word:
-            words[word] = code
-
-    return words
+    return {
+        word: code
+        for word, code in xml_iter_parse(file)
+        # Not a word, but a page from another namespace (Template:, Category:, ...)
+        if word and ":" not in word
+        # No interesting head section, a foreign word?
+        and code and any(section in code for section in sections)
+    }
 
 
 def save(snapshot: str, words: Dict[str, str], output_dir: Path) -> None:
     """Persist data."""
     raw_data = output_dir / f"data_wikicode-{snapshot}.json"
     with raw_data.open(mode="w", encoding="utf-8") as fh:
-        json.dump(words, fh, indent=4, sort_keys=True)
+        # Faster than json.dump(), which always uses the pure-Python encoder
+        fh.write(json.dumps(words, sort_keys=True))
 
     print(f">>> Saved {len(words):,} words into {raw_data}", flush=True)
 
@@ -40,6 +40,22 @@
 
 Sections = Dict[str, wtp.Section]
 
+# Patterns used to prepare the Wikicode, compiled once
+# <!-- foo --> -> ''
+_RE_COMMENT = re.compile(r"<!--.*?-->", flags=re.DOTALL)
+# [DE] {{Bedeutungen}} -> === {{Bedeutungen}} ===
+_RE_DE_SECTION = re.compile(r"^\{\{(.+)\}\}", flags=re.MULTILINE)
+# [DE] :[1] foo -> # foo
+_RE_DE_DEFINITION = re.compile(r":\[\d+\]\s*")
+# [ES] ;1 foo -> # foo
+_RE_ES_DEFINITION = re.compile(r";[0-9]+[ |:]+")
+# [ES] :;a: foo -> ## foo
+_RE_ES_SUBDEFINITION = re.compile(r":;[\s]*[a-z]:+[\s]+")
+# [IT] {{-avv-|it}} -> === {{avv}} ===
+_RE_IT_SECTION_LANG = re.compile(r"^\{\{-(.+)-\|it?\}\}", flags=re.MULTILINE)
+# [IT] {{-avv-}} -> === {{avv}} ===
+_RE_IT_SECTION = re.compile(r"^\{\{-(.+)-\}\}", flags=re.MULTILINE)
+
 # Multiprocessing shared globals, init in render() see #1054
 MANAGER = ""
 LOCK = multiprocessing.Lock()
@@ -61,8 +77,7 @@ def find_definitions(
         return []
 
     # Remove duplicates
-    seen = set()
-    return [d for d in definitions if not (d in seen or seen.add(d))]  # type: ignore
+    return list(dict.fromkeys(definitions))
 
 
 def find_section_definitions(
@@ -84,8 +99,8 @@ def find_section_definitions(
     if locale == "es":
         if lists := section.get_lists(pattern="[:;]"):
             sec = "".join(a_list.string for a_list in lists)
-            section.contents = re.sub(r";[0-9]+[ |:]+", "# ", sec)
-            section.contents = re.sub(r":;[\s]*[a-z]:+[\s]+", "## ", section.contents)
+            section.contents = _RE_ES_DEFINITION.sub("# ", sec)
+            section.contents = _RE_ES_SUBDEFINITION.sub("## ", section.contents)
 
     if lists := section.get_lists(pattern=section_patterns[locale]):
         for a_list in lists:
@@ -215,6 +230,8 @@ def find_etymology(
 
 def find_gender(code: str, pattern: Pattern[str]) -> str:
     """Find the gender."""
+    if not pattern.pattern:  # Empty by default
+        return ""
     match = pattern.search(code)
     if not match:
         return ""
@@ -226,7 +243,7 @@ def find_gender(code: str, pattern: Pattern[str]) -> str:
 
 def find_pronunciations(code: str, pattern: Pattern[str]) -> List[str]:
     """Find pronunciations."""
-    if pattern == re.compile(""):  # Empty by default
+    if not pattern.pattern:  # Empty by default
         return []
     match = pattern.search(code)
     if not match:
@@ -281,16 +298,20 @@ def section_title(title: str) -> str:
     ]
 
     # Get _all_ sections without any filtering
-    all_sections.extend(
-        (
+    # Sections of all levels are retrieved at once: each get_sections() call scans the whole
+    # top section, so it is faster to filter on levels afterwards than to call it for every sublevel.
+    sublevels = section_sublevels[locale]
+    for top_section in top_sections:
+        subsections = [
+            (section.level, section)
+            for section in top_section.get_sections(include_subsections=False)
+        ]
+        all_sections.extend(
             (section.title.strip(), section)
-            for top_section in top_sections
-            for sublevel in section_sublevels[locale]
-            for section in top_section.get_sections(
-                include_subsections=False, level=sublevel
-            )
+            for sublevel in sublevels
+            for level, section in subsections
+            if level == sublevel
         )
-    )
     return all_sections
 
 
@@ -311,26 +332,19 @@ def parse_word(word: str, code: str, locale: str, force: bool = False) -> Word:
     It is disabled by default to speed-up the overall process, but enabled when
     called from get_and_parse_word().
     """
-    code = re.sub(r"(<!--.*?-->)", "", code, flags=re.DOTALL)
+    code = _RE_COMMENT.sub("", code)
 
     if locale == "de":
         # {{Bedeutungen}} -> === {{Bedeutungen}} ===
-        code = re.sub(
-            r"^\{\{(.+)\}\}",
-            r"=== {{\1}} ===",
-            code,
-            flags=re.MULTILINE,
-        )
+        code = _RE_DE_SECTION.sub(r"=== {{\1}} ===", code)
         # Definition lists are not well supported by the parser, replace them by numbered lists
-        code = re.sub(r":\[\d+\]\s*", "# ", code)
+        code = _RE_DE_DEFINITION.sub("# ", code)
 
     elif locale == "it":
         # {{-avv-|it}} -> === {{avv}} ===
-        code = re.sub(
-            r"^\{\{-(.+)-\|it?\}\}", r"=== {{\1}} ===", code, flags=re.MULTILINE
-        )
+        code = _RE_IT_SECTION_LANG.sub(r"=== {{\1}} ===", code)
         # {{-avv-}} -> === {{avv}} ===
-        code = re.sub(r"^\{\{-(.+)-\}\}", r"=== {{\1}} ===", code, flags=re.MULTILINE)
+        code = _RE_IT_SECTION.sub(r"=== {{\1}} ===", code)
 
     parsed_sections = find_sections(code, locale)
     prons = []
@@ -420,6 +434,16 @@ def render_word(w: List[str], words: Words, locale: str) -> None:
             words[word] = details
 
 
+def render_word_worker(w: List[str], locale: str) -> Words:
+    """Render a word from a multiprocessing worker.
+    The result is returned rather than stored into a shared dict, as every write
+    into a managed dict is a round-trip to the manager process.
+    """
+    words: Words = {}
+    render_word(w, words, locale)
+    return words
+
+
 def render(in_words: Dict[str, str], locale: str, workers: int) -> Words:
     # Skip not interesting words early as the parsing is quite heavy
     sections = head_sections[locale]
@@ -431,19 +455,24 @@ def render(in_words: Dict[str, str], locale: str, workers: int) -> Words:
 
     MANAGER = multiprocessing.Manager()
     MISSING_TPL_SEEN: List[str] = MANAGER.list()  # noqa
-    results: Words = MANAGER.dict()
+    results: Words = {}
 
     with multiprocessing.Pool(processes=workers) as pool:
-        pool.map(partial(render_word, words=results, locale=locale), in_words.items())
+        for words in pool.imap_unordered(
+            partial(render_word_worker, locale=locale),
+            in_words.items(),
+            chunksize=256,
+        ):
+            results.update(words)
 
-    return results.copy()
+    return results
 
 
 def save(snapshot: str, words: Words, output_dir: Path) -> None:
     """Persist data."""
     raw_data = output_dir / f"data-{snapshot}.json"
     with raw_data.open(mode="w", encoding="utf-8") as fh:
-        json.dump(words, fh, indent=4, sort_keys=True)
+        fh.write(json.dumps(words, sort_keys=True))
     print(f">>> Saved {len(words):,} words into {raw_data}", flush=True)
 
 
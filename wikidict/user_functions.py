@@ -7,6 +7,11 @@
 from collections import defaultdict
 from typing import Dict, List, Optional
 
+# Roman numerals of each digit, used by int_to_roman()
+_ROMAN_HUNDREDS = ("", "C", "CC", "CCC", "CD", "D", "DC", "DCC", "DCCC", "CM")
+_ROMAN_TENS = ("", "X", "XX", "XXX", "XL", "L", "LX", "LXX", "LXXX", "XC")
+_ROMAN_UNITS = ("", "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX")
+
 
 def capitalize(text: str) -> str:
     """
@@ -20,8 +25,10 @@ def capitalize(text: str) -> str:
         'BOB'
         >>> capitalize("alice and bob")
         'Alice and bob'
+        >>> capitalize("ǆungla")
+        'ǅungla'
     """
-    return "" if not text else f"{text[0].capitalize()}{text[1:]}"
+    return text[:1].capitalize() + text[1:]
 
 
 def century(parts: List[str], century: str) -> str:
@@ -255,19 +262,21 @@ def int_to_roman(number: int) -> str:
         'XII'
         >>> int_to_roman(2020)
         'MMXX'
-
-    Source: https://www.oreilly.com/library/view/python-cookbook/0596001673/ch03s24.html
-    """
-    # if not 0 < number < 4000:
-    #     raise ValueError("Argument must be between 1 and 3999")
-    ints = (1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1)
-    nums = ("M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I")
-    result = []
-    for i in range(len(ints)):
-        count = int(number / ints[i])
-        result.append(nums[i] * count)
-        number -= ints[i] * count
-    return "".join(result)
+        >>> int_to_roman(3999)
+        'MMMCMXCIX'
+        >>> int_to_roman(0)
+        ''
+        >>> int_to_roman(-5)
+        ''
+    """
+    if number <= 0:
+        return ""
+    return (
+        "M" * (number // 1000)
+        + _ROMAN_HUNDREDS[number // 100 % 10]
+        + _ROMAN_TENS[number // 10 % 10]
+        + _ROMAN_UNITS[number % 10]
+    )
 
 
 def italic(text: str) -> str:
@@ -5,9 +5,10 @@
 from datetime import datetime
 from functools import partial
 from pathlib import Path
+from types import CodeType
 from typing import List, Match, Tuple, Union
 
-from cachetools import cached
+from cachetools import LRUCache, cached
 from cachetools.keys import hashkey
 import regex
 import requests
@@ -31,6 +32,7 @@
 )
 from .user_functions import *  # noqa
 from .hiero_utils import render_hiero
+from .stubs import Parts
 
 
 # Magic words (small part, only data/time related)
@@ -49,6 +51,10 @@
     "CURRENTTIMESTAMP": NOW.strftime("%Y%m%d%H%M%S"),
 }
 
+# Innermost templates, processed by process_templates()
+# {{foo|{{bar|baz}}|123}} -> {{bar|baz}}
+_RE_TEMPLATE = re.compile(r"({{[^{}]*}})")
+
 # Templates needed to be kept after transform()
 Template = namedtuple("Template", "placeholder value")
 SPECIAL_TEMPLATES = {
@@ -56,6 +62,64 @@
     "{{=}}": Template("##equal##!##equal##", "="),
 }
 
+# Characters that may be part of a markup handled by clean()
+_MARKUP_CHARS = "\n'<[]{=*_"
+
+# Patterns used by clean(), in order of use.
+# <ref name="CFC"/> -> ''
+_RE_REF_EMPTY = re.compile(r"<ref[^>]*/>")
+# <ref name="CFC">{{Import:CFC}}</ref> -> ''
+_RE_REF = re.compile(r"<ref[^>]*/?>[\s\S]*?</ref>")
+# <!-- foo --> -> ''
+_RE_HTML_COMMENT = re.compile(r"<!--(?:.+-->)?")
+# Source: https://github.com/5j9/wikitextparser/blob/b24033b/wikitextparser/_wikitext.py#L83
+# '''foo''' -> <b>foo</b>
+_RE_BOLD = regex.compile(r"'''(\0*+[^'\n]++.*?)(?:''')")
+# ''foo'' -> <i>foo</i>
+_RE_ITALIC = regex.compile(r"''(\0*+[^'\n]++.*?)(?:'')")
+# <br> / <br /> -> ''
+_RE_BR = re.compile(r"<br[^>]+/?>")
+# [[a]] -> a
+_RE_LINK_SIMPLE = re.compile(r"\[\[([^||:\]]+)\]\]")
+# [[File:foo.jpg|...]] -> ''
+_RE_FILE = re.compile(rf"\[\[(?:{'|'.join(pattern_file)}):.+?(?=\]\])\]\]*")
+# [[{{a|b}}]] -> {{a|b}}
+_RE_LINK_TPL = re.compile(r"\[\[({{[^}]+}})\]\]")
+# [[a|b]] -> b
+_RE_LINK_PIPE = re.compile(r"\[\[[^|]+\|(.+?(?=\]\]))\]\]")
+# {|foo..|} -> ''
+_RE_TABLE = re.compile(r"{\|[^}]+\|}")
+# == a == -> a
+_RE_HEADING = re.compile(r"^=+\s?([^=]+)\s?=+", flags=re.MULTILINE)
+# [[foo:b]] -> ''
+_RE_NS_LINK = re.compile(r"\[\[[^:\]]+:[^\]]+\]\]")
+# [http://example.com] -> ''
+_RE_EXTERNAL_LINK = re.compile(r"\[https?://[^\s\]]+\]")
+# * foo -> foo
+_RE_LIST = re.compile(r"^\*+\s?", flags=re.MULTILINE)
+# __TOC__ -> ''
+_RE_MAGIC = re.compile(r"__\w+__")
+# <sup></sup> -> ''
+_RE_EMPTY_TAG = re.compile(r"<([^>]+)></\1>")
+# Both spaces passes are fused, dispatched on the matched group
+# "foo  bar" -> "foo bar"
+# "foo ." -> "foo."
+_RE_SPACES = re.compile(r"(?P<dot>\s+\.)|\s{2,}")
+# <<bar>> -> bar
+_RE_CHEVRONS = re.compile(r"<<([^/>]+)>>")
+# <<foo/bar>> -> bar
+_RE_CHEVRONS_PATH = re.compile(r"<<(?:[^/>]+)/([^>]+)>>")
+
+
+def _clean_heading(match: Match[str]) -> str:
+    """Replacement function for *_RE_HEADING*."""
+    return match.group(1).strip()
+
+
+def _clean_spaces(match: Match[str]) -> str:
+    """Replacement function for *_RE_SPACES*."""
+    return "." if match.lastgroup == "dot" else " "
+
 
 def convert_gender(gender: str) -> str:
     """Return the HTML code to include for the gender of a word."""
@@ -313,72 +377,76 @@ def clean(text: str) -> str:
         'country'
         >>> clean("<<region/Middle East>>")
         'Middle East'
+        >>> clean("foo  bar  .")
+        'foo bar.'
+        >>> clean("b<!--<ref>--></ref>")
+        'b'
+        >>> clean("<<b/<<a>>")
+        '<<b/a'
+        >>> clean(" No markup at  all . ")
+        'No markup at all.'
     """
 
-    # Speed-up lookup
-    sub = re.sub
-    sub2 = regex.sub
+    # Fast path: text without any markup only needs spaces to be cleaned up
+    if not any(char in text for char in _MARKUP_CHARS):
+        return _RE_SPACES.sub(_clean_spaces, text).strip()
 
     # Remove line breaks
     text = text.replace("\n", "")
 
     # Parser hooks
     # <ref name="CFC"/> -> ''
-    text = sub(r"<ref[^>]*/>", "", text)
+    text = _RE_REF_EMPTY.sub("", text)
     # <ref>foo</ref> -> ''
     # <ref name="CFC">{{Import:CFC}}</ref> -> ''
     # <ref name="CFC"><tag>...</tag></ref> -> ''
-    text = sub(r"<ref[^>]*/?>[\s\S]*?</ref>", "", text)
+    text = _RE_REF.sub("", text)
 
     # HTML
     # <-- foo --> -> ''
-    text = sub(r"<!--(?:.+-->)?", "", text)
-    # Source: https://github.com/5j9/wikitextparser/blob/b24033b/wikitextparser/_wikitext.py#L83
-    text = sub2(r"'''(\0*+[^'\n]++.*?)(?:''')", "<b>\\1</b>", text)
-    # ''foo'' -> <i>foo></i>
-    text = sub2(r"''(\0*+[^'\n]++.*?)(?:'')", "<i>\\1</i>", text)
+    text = _RE_HTML_COMMENT.sub("", text)
+    if "''" in text:
+        # '''foo''' -> <b>foo</b>
+        text = _RE_BOLD.sub("<b>\\1</b>", text)
+        # ''foo'' -> <i>foo></i>
+        text = _RE_ITALIC.sub("<i>\\1</i>", text)
     # <br> / <br /> -> ''
-    text = sub(r"<br[^>]+/?>", "", text)
+    text = _RE_BR.sub("", text)
 
     # <nowiki/> -> ''
     text = text.replace("<nowiki/>", "")
 
-    # Local links
-    text = sub(r"\[\[([^||:\]]+)\]\]", "\\1", text)  # [[a]] -> a
+    if "[[" in text:
+        # Local links
+        text = _RE_LINK_SIMPLE.sub("\\1", text)  # [[a]] -> a
 
-    # Files
-    pattern = "|".join(iter(pattern_file))
-    text = sub(rf"\[\[(?:{pattern}):.+?(?=\]\])\]\]*", "", text)
+        # Files
+        text = _RE_FILE.sub("", text)
 
-    # More local links
-    text = sub(r"\[\[({{[^}]+}})\]\]", "\\1", text)  # [[{{a|b}}]] -> {{a|b}}
-    text = sub(r"\[\[[^|]+\|(.+?(?=\]\]))\]\]", "\\1", text)  # [[a|b]] -> b
+        # More local links
+        text = _RE_LINK_TPL.sub("\\1", text)  # [[{{a|b}}]] -> {{a|b}}
+        text = _RE_LINK_PIPE.sub("\\1", text)  # [[a|b]] -> b
 
     # Tables
-    text = sub(r"{\|[^}]+\|}", "", text)  # {|foo..|}
+    text = _RE_TABLE.sub("", text)  # {|foo..|}
 
     # Headings
-    text = sub(
-        r"^=+\s?([^=]+)\s?=+",
-        lambda matches: matches.group(1).strip(),
-        text,
-        flags=re.MULTILINE,
-    )  # == a == -> a
+    text = _RE_HEADING.sub(_clean_heading, text)  # == a == -> a
 
     # Files and other links with namespaces
-    text = sub(r"\[\[[^:\]]+:[^\]]+\]\]", "", text)  # [[foo:b]] -> ''
+    text = _RE_NS_LINK.sub("", text)  # [[foo:b]] -> ''
 
     # External links
     # [http://example.com] -> ''
-    text = sub(r"\[https?://[^\s\]]+\]", "", text)
+    text = _RE_EXTERNAL_LINK.sub("", text)
 
     text = text.replace("[[", "").replace("]]", "")
 
     # Lists
-    text = sub(r"^\*+\s?", "", text, flags=re.MULTILINE)
+    text = _RE_LIST.sub("", text)
 
     # Magic words
-    text = sub(r"__\w+__", "", text)  # __TOC__
+    text = _RE_MAGIC.sub("", text)  # __TOC__
 
     # Remove extra quotes left
     text = text.replace("''", "")
@@ -389,16 +457,15 @@ def clean(text: str) -> str:
 
     # Remove empty HTML tags
     # <sup></sup> -> ''
-    text = sub(r"<([^>]+)></\1>", "", text)
+    text = _RE_EMPTY_TAG.sub("", text)
 
     # Remove extra spaces
-    text = sub(r"\s{2,}", " ", text)
-    text = sub(r"\s{1,}\.", ".", text)
+    text = _RE_SPACES.sub(_clean_spaces, text)
 
-    # <<bar>> -> foo
+    # <<bar>> -> bar
     # <<foo/bar>> -> bar
-    text = sub(r"<<([^/>]+)>>", "\\1", text)
-    text = sub(r"<<(?:[^/>]+)/([^>]+)>>", "\\1", text)
+    text = _RE_CHEVRONS.sub("\\1", text)
+    text = _RE_CHEVRONS_PATH.sub("\\1", text)
 
     return text.strip()
 
@@ -443,16 +510,18 @@ def process_templates(word: str, text: str, locale: str) -> str:
     # {{foo|{{bar|baz}}|123}}
     # {{foo|{{bar|lang|{{baz|args}}}}|123}}
 
-    # Handle all templates
+    def handle_template(match: Match[str]) -> str:
+        tpl = match.group(1)
+        if tpl in SPECIAL_TEMPLATES:
+            return str(SPECIAL_TEMPLATES[tpl].placeholder)
+        # Transform the template
+        return transform(word, tpl[2:-2], locale)
+
+    # Handle all templates, one nesting level per pass
     while "there are templates":
-        templates = set(re.findall(r"({{[^{}]*}})", text))
-        if not templates:
+        text, count = _RE_TEMPLATE.subn(handle_template, text)
+        if not count:
             break
-        for tpl in templates:
-            if tpl in SPECIAL_TEMPLATES:
-                text = text.replace(tpl, SPECIAL_TEMPLATES[tpl].placeholder)
-            # Transform the template
-            text = text.replace(tpl, transform(word, tpl[2:-2], locale))
 
     for tpl in SPECIAL_TEMPLATES.values():
         text = text.replace(tpl.placeholder, tpl.value)
@@ -535,20 +604,21 @@ def convert_hiero(match: Union[str, Match[str]], word: str) -> str:
 
 
 def table2html(word: str, locale: str, table: wikitextparser.Table) -> str:
-    phrase = "<table>"
     style_table = 'style="border: 1px solid black; border-collapse: collapse;"'
     style_td = (
         'style="border: 1px solid black; padding: 0.2em 0.4em; font-size: 2.5em;"'
     )
-    phrase = f"<table {style_table}>"
+    phrase = [f"<table {style_table}>"]
     for row in table.cells(span=False):
-        phrase += "<tr>"
+        phrase.append("<tr>")
         for cell in row:
             tag = "th" if cell.is_header else "td"
-            phrase += f"<{tag} {style_td}>{process_templates(word, clean(cell.value), locale)}</{tag}>"
-        phrase += "</tr>"
-    phrase += "</table>"
-    return phrase
+            phrase.append(
+                f"<{tag} {style_td}>{process_templates(word, clean(cell.value), locale)}</{tag}>"
+            )
+        phrase.append("</tr>")
+    phrase.append("</table>")
+    return "".join(phrase)
 
 
 def transform(word: str, template: str, locale: str) -> str:
@@ -582,8 +652,35 @@ def transform(word: str, template: str, locale: str) -> str:
         >>> assert len(transform("foo", "CURRENTTIMESTAMP", "fr")) == 14
     """
 
-    parts_raw = template.split("|")
-    parts = [p.strip() for p in parts_raw]
+    tpl, parts = split_template(template)
+
+    # Stop early
+    if not tpl or tpl in templates_ignored[locale]:
+        return ""
+
+    # Magic words
+    if tpl in MAGIC_WORDS:
+        return MAGIC_WORDS[tpl]
+    elif tpl == "PAGENAME" or (tpl == "w" and len(parts) == 1):
+        return word.replace("_", " ")
+
+    return str(transform_apply(word, tpl, parts, locale))
+
+
+@cached(cache=LRUCache(maxsize=100_000))
+def split_template(template: str) -> Tuple[str, Parts]:
+    """Split the *template* into its name and its parts.
+    The same templates are used over and over across words, hence the cache.
+    *parts* is a tuple because lists are not hashable, and thus cannot be used with the transform_apply() cache.
+
+        >>> split_template("grammaire |fr")
+        ('grammaire', ('grammaire', 'fr'))
+        >>> split_template("formatnum:123")
+        ('formatnum', ('formatnum', '123'))
+        >>> split_template("R:TLFi|foo")
+        ('R:TLFi', ('R:TLFi', 'foo'))
+    """
+    parts = [p.strip() for p in template.split("|")]
     parts = [p.strip("\u200e") for p in parts]  # Left-to-right mark
     tpl = parts[0]
 
@@ -595,30 +692,27 @@ def transform(word: str, template: str, locale: str) -> str:
         "R:Rivarol",
         "R:DAF6",
     ):
-        parts_raw = template.split(":")
-        parts = [p.strip() for p in parts_raw]
+        parts = [p.strip() for p in template.split(":")]
         tpl = parts[0]
 
-    # Stop early
-    if not tpl or tpl in templates_ignored[locale]:
-        return ""
+    return tpl, tuple(parts)
 
-    # Magic words
-    if tpl in MAGIC_WORDS:
-        return MAGIC_WORDS[tpl]
-    elif tpl == "PAGENAME" or (tpl == "w" and len(parts) == 1):
-        return word.replace("_", " ")
 
-    # Convert *parts* from a list to a tuple because list are not hashable and thus cannot be used
-    # with the LRU cache.
-    return str(transform_apply(word, tpl, tuple(parts), locale))
+@cached(cache={})
+def compile_template_multi(tpl: str, locale: str) -> CodeType:
+    """Compile the code of the *tpl* template from *templates_multi* using the *locale*.
+    It is done only once per template, instead of on every eval() call.
+    Raise a KeyError if the template is not part of *templates_multi*.
+    """
+    code: CodeType = compile(templates_multi[locale][tpl], f"<{tpl}>", "eval")
+    return code
 
 
 @cached(cache={}, key=lambda word, tpl, parts, locale: hashkey(tpl, parts, locale))  # type: ignore
 def transform_apply(word: str, tpl: str, parts: Tuple[str, ...], locale: str) -> str:
     """Convert the data from the *tpl* template of the *word* using the *locale*."""
     with suppress(KeyError):
-        return eval(templates_multi[locale][tpl])  # type: ignore
+        return eval(compile_template_multi(tpl, locale))  # type: ignore
 
     if len(parts) == 1:
         with suppress(KeyError):